@@ -12,6 +12,21 @@ import { KubectlV30Layer } from '@aws-cdk/lambda-layer-kubectl-v30';
 import { ConfigParser } from './config-parser';
 import { WorkflowTemplateGenerator } from './workflow-template-generator';
 
+/**
+ * Matches `${VARIABLE}` placeholders in the bundled Argo manifest templates.
+ */
+const TEMPLATE_VARIABLE_PATTERN = /\$\{([A-Z_]+)\}/g;
+
+/**
+ * Substitute `${VARIABLE}` placeholders in a manifest template in a single pass.
+ * Placeholders without a value are left untouched.
+ */
+function substituteTemplateVariables(template: string, variables: Record<string, string>): string {
+  return template.replace(TEMPLATE_VARIABLE_PATTERN, (placeholder: string, name: string) =>
+    Object.prototype.hasOwnProperty.call(variables, name) ? variables[name] : placeholder
+  );
+}
+
 export interface AphexPipelineStackProps extends cdk.StackProps {
   // ===== Required Parameters =====
   
@@ -102,6 +117,14 @@ export interface AphexPipelineStackProps extends cdk.StackProps {
    */
   artifactRetentionDays?: number;
   
+  /**
+   * Multipart part size for artifact transfers, as an AWS CLI size string
+   * (KB/MB/GB, KiB/MiB/GiB or a byte count)
+   * @example '16MB'
+   * @default '50MB' for uploads, '8MB' for downloads
+   */
+  artifactMultipartChunksize?: string;
+  
   // ===== Argo Configuration =====
   
   /**
@@ -490,7 +513,10 @@ export class AphexPipelineStack extends cdk.Stack {
       config.deployerImage,
       this.workflowExecutionRoleArn,
       config.workflowTemplateName,
-      config.argoNamespace
+      config.argoNamespace,
+      {
+        multipartChunksize: props.artifactMultipartChunksize,
+      }
     );
     const workflowTemplate = workflowGenerator.generate();
 
@@ -737,13 +763,14 @@ export class AphexPipelineStack extends cdk.Stack {
     const template = fs.readFileSync(templatePath, 'utf8');
 
     // Substitute variables
-    const processedYaml = template
-      .replace(/\$\{EVENT_SOURCE_NAME\}/g, config.eventSourceName)
-      .replace(/\$\{ARGO_EVENTS_NAMESPACE\}/g, config.argoEventsNamespace)
-      .replace(/\$\{GITHUB_OWNER\}/g, props.githubOwner)
-      .replace(/\$\{GITHUB_REPO\}/g, props.githubRepo)
-      .replace(/\$\{GITHUB_TOKEN_SECRET_NAME\}/g, config.githubTokenSecretK8sName)
-      .replace(/\$\{GITHUB_WEBHOOK_SECRET_NAME\}/g, config.githubWebhookSecretK8sName);
+    const processedYaml = substituteTemplateVariables(template, {
+      EVENT_SOURCE_NAME: config.eventSourceName,
+      ARGO_EVENTS_NAMESPACE: config.argoEventsNamespace,
+      GITHUB_OWNER: props.githubOwner,
+      GITHUB_REPO: props.githubRepo,
+      GITHUB_TOKEN_SECRET_NAME: config.githubTokenSecretK8sName,
+      GITHUB_WEBHOOK_SECRET_NAME: config.githubWebhookSecretK8sName,
+    });
 
     // Parse and apply
     const manifest = jsyaml.load(processedYaml) as Record<string, any>;
@@ -922,15 +949,16 @@ export class AphexPipelineStack extends cdk.Stack {
     // Substitute variables
     const githubBranchRef = `refs/heads/${config.githubBranch}`;
     const sensorServiceAccountName = `${config.sensorName}-sa`;
-    const processedYaml = template
-      .replace(/\$\{SENSOR_NAME\}/g, config.sensorName)
-      .replace(/\$\{ARGO_EVENTS_NAMESPACE\}/g, config.argoEventsNamespace)
-      .replace(/\$\{EVENT_SOURCE_NAME\}/g, config.eventSourceName)
-      .replace(/\$\{GITHUB_BRANCH_REF\}/g, githubBranchRef)
-      .replace(/\$\{SENSOR_SERVICE_ACCOUNT_NAME\}/g, sensorServiceAccountName)
-      .replace(/\$\{WORKFLOW_TEMPLATE_NAME\}/g, config.workflowTemplateName)
-      .replace(/\$\{WORKFLOW_NAME_PREFIX\}/g, config.workflowNamePrefix)
-      .replace(/\$\{ARGO_NAMESPACE\}/g, config.argoNamespace);
+    const processedYaml = substituteTemplateVariables(template, {
+      SENSOR_NAME: config.sensorName,
+      ARGO_EVENTS_NAMESPACE: config.argoEventsNamespace,
+      EVENT_SOURCE_NAME: config.eventSourceName,
+      GITHUB_BRANCH_REF: githubBranchRef,
+      SENSOR_SERVICE_ACCOUNT_NAME: sensorServiceAccountName,
+      WORKFLOW_TEMPLATE_NAME: config.workflowTemplateName,
+      WORKFLOW_NAME_PREFIX: config.workflowNamePrefix,
+      ARGO_NAMESPACE: config.argoNamespace,
+    });
 
     // Parse and apply
     const manifest = jsyaml.load(processedYaml) as Record<string, any>;
@@ -1023,11 +1051,12 @@ export class AphexPipelineStack extends cdk.Stack {
     const template = fs.readFileSync(templatePath, 'utf8');
 
     // Substitute variables
-    const processedYaml = template
-      .replace(/\$\{ARGO_NAMESPACE\}/g, config.argoNamespace)
-      .replace(/\$\{ARTIFACT_BUCKET\}/g, artifactBucket)
-      .replace(/\$\{WORKFLOW_EXECUTION_ROLE_ARN\}/g, roleArn)
-      .replace(/\$\{SERVICE_ACCOUNT_NAME\}/g, config.serviceAccountName);
+    const processedYaml = substituteTemplateVariables(template, {
+      ARGO_NAMESPACE: config.argoNamespace,
+      ARTIFACT_BUCKET: artifactBucket,
+      WORKFLOW_EXECUTION_ROLE_ARN: roleArn,
+      SERVICE_ACCOUNT_NAME: config.serviceAccountName,
+    });
 
     // Parse all documents (logging-config.yaml has multiple YAML documents)
     const manifests = jsyaml.loadAll(processedYaml) as Record<string, any>[];
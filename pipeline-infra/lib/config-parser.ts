@@ -15,6 +15,12 @@ export interface StackConfig {
  */
 export interface TestConfig {
   commands: string[];
+  /**
+   * Run the test commands concurrently instead of one after another.
+   * Only set this when the commands do not depend on each other.
+   * @default false
+   */
+  parallel?: boolean;
 }
 
 /**
@@ -44,6 +50,13 @@ export interface AphexConfig {
   environments: EnvironmentConfig[];
 }
 
+/**
+ * Parsed configurations keyed by absolute path. An entry is reused while the
+ * file's mtime and size are unchanged, so multiple stacks in one CDK app
+ * share a single read and parse of the same aphex-config.yaml.
+ */
+const parsedConfigCache = new Map<string, { mtimeMs: number; size: number; config: AphexConfig }>();
+
 /**
  * Parser for AphexPipeline configuration files.
  */
@@ -51,17 +64,44 @@ export class ConfigParser {
   /**
    * Parse and validate a configuration file.
    * 
+   * Results are cached per file. Each call returns its own copy of the cached
+   * configuration, so changes made by one caller are not seen by the next.
+   * 
    * @param configPath Path to the aphex-config.yaml file
    * @returns Parsed and validated AphexConfig object
    */
   static parse(configPath: string): AphexConfig {
-    // Check if file exists
-    if (!fs.existsSync(configPath)) {
-      throw new Error(`Configuration file not found: ${configPath}`);
+    const resolvedPath = path.resolve(configPath);
+
+    // Check if file exists (and capture mtime/size for the cache)
+    let stats: fs.Stats;
+    try {
+      stats = fs.statSync(resolvedPath);
+    } catch (error: any) {
+      if (error.code === 'ENOENT') {
+        throw new Error(`Configuration file not found: ${configPath}`);
+      }
+      throw error;
+    }
+
+    const cached = parsedConfigCache.get(resolvedPath);
+    if (cached && cached.mtimeMs === stats.mtimeMs && cached.size === stats.size) {
+      return structuredClone(cached.config);
     }
 
+    const config = ConfigParser.parseContents(fs.readFileSync(resolvedPath, 'utf8'));
+    parsedConfigCache.set(resolvedPath, { mtimeMs: stats.mtimeMs, size: stats.size, config });
+    return structuredClone(config);
+  }
+
+  /**
+   * Parse and validate configuration file contents.
+   * 
+   * @param fileContents Raw YAML contents of an aphex-config.yaml file
+   * @returns Parsed and validated AphexConfig object
+   */
+  private static parseContents(fileContents: string): AphexConfig {
     // Load YAML
-    const fileContents = fs.readFileSync(configPath, 'utf8');
     const configData = yaml.load(fileContents) as any;
 
     // Basic validation
@@ -71,6 +111,12 @@ export class ConfigParser {
     if (!configData.build || !configData.build.commands) {
       throw new Error('Configuration missing required field: build.commands');
     }
+    if (
+      !Array.isArray(configData.build.commands) ||
+      !configData.build.commands.every((command: unknown) => typeof command === 'string')
+    ) {
+      throw new Error('Configuration field build.commands must be a list of strings');
+    }
     if (!configData.environments || !Array.isArray(configData.environments)) {
       throw new Error('Configuration missing required field: environments');
     }
@@ -96,8 +142,12 @@ export class ConfigParser {
         };
       });
 
+      if (envData.tests?.parallel !== undefined && typeof envData.tests.parallel !== 'boolean') {
+        throw new Error('Configuration field tests.parallel must be a boolean');
+      }
+
       const tests: TestConfig | undefined = envData.tests?.commands
-        ? { commands: envData.tests.commands }
+        ? { commands: envData.tests.commands, parallel: envData.tests.parallel }
         : undefined;
 
       return {
@@ -7,3 +7,4 @@ export type { AphexPipelineStackProps } from './aphex-pipeline-stack';
 // Export utility classes (if needed by consumers)
 export { ConfigParser } from './config-parser';
 export { WorkflowTemplateGenerator } from './workflow-template-generator';
+export type { S3TransferOptions } from './workflow-template-generator';
@@ -1,5 +1,51 @@
 import { AphexConfig, EnvironmentConfig } from './config-parser';
 
+/**
+ * Artifact sets with more files than this are uploaded as a single tar
+ * archive instead of one S3 object per file.
+ */
+const ARTIFACT_BUNDLE_THRESHOLD = 20;
+
+/**
+ * Artifact sets larger than this many bytes are never bundled, since a
+ * single archive stream would give up the parallel per-file transfers that
+ * large files benefit from.
+ */
+const ARTIFACT_BUNDLE_MAX_BYTES = 100 * 1024 * 1024;
+
+/**
+ * Object name of the artifact archive under the commit's S3 prefix.
+ */
+const ARTIFACT_BUNDLE_NAME = '.aphex-artifacts.tar';
+
+/**
+ * Object name of the archive's file listing under the commit's S3 prefix.
+ */
+const ARTIFACT_MANIFEST_NAME = '.aphex-artifacts-manifest.txt';
+
+/**
+ * Stage-local AWS CLI config used only by artifact transfer commands.
+ */
+const S3_TRANSFER_CONFIG_FILE = '/tmp/aws/config';
+
+/**
+ * Sizes the AWS CLI accepts: a positive byte count, optionally followed by a
+ * KB/MB/GB or KiB/MiB/GiB suffix.
+ */
+const S3_TRANSFER_SIZE_PATTERN = /^[1-9]\d*([KMG]i?B)?$/;
+
+/**
+ * Tuning for AWS CLI S3 transfers performed by generated stages.
+ */
+export interface S3TransferOptions {
+  /**
+   * Multipart part size, as an AWS CLI size string (e.g. '16MB', '16MiB' or
+   * a byte count)
+   * @default '50MB' for uploads, '8MB' for downloads
+   */
+  multipartChunksize?: string;
+}
+
 /**
  * Generates Argo WorkflowTemplate manifests from AphexPipeline configuration.
  */
@@ -12,6 +58,7 @@ export class WorkflowTemplateGenerator {
   private workflowExecutionRoleArn: string;
   private workflowTemplateName: string;
   private namespace: string;
+  private s3TransferOptions: S3TransferOptions;
 
   constructor(
     config: AphexConfig,
@@ -21,8 +68,20 @@ export class WorkflowTemplateGenerator {
     deployerImage: string,
     workflowExecutionRoleArn: string,
     workflowTemplateName: string,
-    namespace: string
+    namespace: string,
+    s3TransferOptions: S3TransferOptions = {}
   ) {
+    // Transfer sizes are rendered into stage scripts, so reject anything else
+    if (
+      s3TransferOptions.multipartChunksize !== undefined &&
+      !S3_TRANSFER_SIZE_PATTERN.test(s3TransferOptions.multipartChunksize)
+    ) {
+      throw new Error(
+        `multipartChunksize must be a positive size such as '16MB', '16MiB' or a byte count, ` +
+        `got: ${s3TransferOptions.multipartChunksize}`
+      );
+    }
+
     this.config = config;
     this.artifactBucketName = artifactBucketName;
     this.serviceAccountName = serviceAccountName;
@@ -31,6 +90,7 @@ export class WorkflowTemplateGenerator {
     this.workflowExecutionRoleArn = workflowExecutionRoleArn;
     this.workflowTemplateName = workflowTemplateName;
     this.namespace = namespace;
+    this.s3TransferOptions = s3TransferOptions;
   }
 
   /**
@@ -108,19 +168,24 @@ export class WorkflowTemplateGenerator {
           '-c',
           `
         set -e
-        echo "Cloning repository..."
-        git clone {{inputs.parameters.repo-url}} /workspace
-        cd /workspace
-        git checkout {{inputs.parameters.commit-sha}}
+        ${this.generateCheckoutScript()}
         
         echo "Executing build commands..."
         ${buildCommands}
         
         echo "Uploading artifacts to S3..."
-        if [ -d ./artifacts ]; then
-          aws s3 sync ./artifacts s3://${this.artifactBucketName}/{{inputs.parameters.commit-sha}}/
+        ${this.generateS3TransferConfigScript('upload')}
+        ARTIFACT_COUNT=$(find -L ./artifacts -type f 2>/dev/null | wc -l)
+        ARTIFACT_BYTES=$(du -sbL ./artifacts 2>/dev/null | cut -f1)
+        if [ "$ARTIFACT_COUNT" -eq 0 ]; then
+          echo "No artifacts found, skipping upload"
+        elif [ "$ARTIFACT_COUNT" -gt ${ARTIFACT_BUNDLE_THRESHOLD} ] && [ "$ARTIFACT_BYTES" -le ${ARTIFACT_BUNDLE_MAX_BYTES} ]; then
+          echo "Bundling $ARTIFACT_COUNT artifacts into a single archive..."
+          (cd ./artifacts && find -L . -type f) > /tmp/${ARTIFACT_MANIFEST_NAME}
+          (set -o pipefail; tar -C ./artifacts -chf - . | AWS_CONFIG_FILE=${S3_TRANSFER_CONFIG_FILE} aws s3 cp - s3://${this.artifactBucketName}/{{inputs.parameters.commit-sha}}/${ARTIFACT_BUNDLE_NAME})
+          AWS_CONFIG_FILE=${S3_TRANSFER_CONFIG_FILE} aws s3 cp /tmp/${ARTIFACT_MANIFEST_NAME} s3://${this.artifactBucketName}/{{inputs.parameters.commit-sha}}/${ARTIFACT_MANIFEST_NAME}
         else
-          echo "No artifacts directory found, skipping upload"
+          AWS_CONFIG_FILE=${S3_TRANSFER_CONFIG_FILE} aws s3 sync ./artifacts s3://${this.artifactBucketName}/{{inputs.parameters.commit-sha}}/
         fi
         
         echo "Build stage complete"
@@ -150,6 +215,74 @@ export class WorkflowTemplateGenerator {
     };
   }
 
+  /**
+   * Generate the bash snippet that checks out the workflow commit into /workspace.
+   *
+   * Fetches only the requested commit (shallow, git protocol v2) rather than
+   * cloning the full history. Falls back to a full fetch when the git server
+   * does not allow fetching an unadvertised commit by SHA. Submodules are not
+   * initialized here, but the repo is configured so any
+   * `git submodule update` run by user commands fetches them in parallel.
+   */
+  private generateCheckoutScript(): string {
+    return `echo "Cloning repository..."
+        git init -q /workspace
+        cd /workspace
+        git remote add origin {{inputs.parameters.repo-url}}
+        git config submodule.fetchJobs 0
+        if git -c protocol.version=2 fetch --depth=1 origin {{inputs.parameters.commit-sha}}; then
+          git checkout -q --detach FETCH_HEAD
+        else
+          echo "Shallow fetch by commit SHA rejected, falling back to full fetch..."
+          git -c protocol.version=2 fetch origin
+          git checkout -q --detach {{inputs.parameters.commit-sha}}
+        fi`;
+  }
+
+  /**
+   * Generate the bash snippet that tunes AWS CLI S3 transfers for this stage.
+   *
+   * Uses the AWS Common Runtime (CRT) transfer client for uploads and
+   * downloads, which parallelizes part transfers in native code. Uploads use
+   * large parts to keep the PUT count low; downloads use smaller parts so
+   * mid-sized artifacts are fetched as parallel ranged GETs. Adaptive retries
+   * absorb transient throttling and 5xx responses instead of failing the
+   * stage. Settings are written to a stage-local config file that only the
+   * artifact transfer commands point AWS_CONFIG_FILE at, so CDK and user
+   * commands keep using the image's AWS config.
+   */
+  private generateS3TransferConfigScript(direction: 'upload' | 'download'): string {
+    const multipartThreshold = direction === 'upload' ? '16MB' : '8MB';
+    const multipartChunksize =
+      this.s3TransferOptions.multipartChunksize ?? (direction === 'upload' ? '50MB' : '8MB');
+
+    return `mkdir -p /tmp/aws
+        printf '%s\\n' '[default]' \\
+          'retry_mode = adaptive' \\
+          'max_attempts = 10' \\
+          's3 =' \\
+          '  multipart_threshold = ${multipartThreshold}' \\
+          '  multipart_chunksize = ${multipartChunksize}' \\
+          '  preferred_transfer_client = crt' \\
+          '  target_bandwidth = 5Gb/s' \\
+          > ${S3_TRANSFER_CONFIG_FILE}`;
+  }
+
+  /**
+   * Generate the bash snippet that installs npm dependencies in the current directory.
+   *
+   * Uses `npm ci` when a lockfile is present, which installs straight from the
+   * lockfile without re-resolving the dependency tree, and skips the audit
+   * and funding network calls.
+   */
+  private generateInstallDependenciesScript(): string {
+    return `if [ -f package-lock.json ]; then
+          npm ci --prefer-offline --no-audit --no-fund
+        else
+          npm install --no-audit --no-fund
+        fi`;
+  }
+
   /**
    * Generate the pipeline deployment stage template.
    * 
@@ -162,6 +295,8 @@ export class WorkflowTemplateGenerator {
    * 
    * It does NOT modify cluster infrastructure (EKS, Argo Workflows, Argo Events).
    * WorkflowTemplate updates take effect on the next workflow run, not the current one.
+   * The stack is deployed from the synthesized cloud assembly so the app is
+   * only synthesized once.
    */
   private generatePipelineDeploymentStage(): any {
     return {
@@ -180,19 +315,16 @@ export class WorkflowTemplateGenerator {
           `
         set -e
         
-        echo "Cloning repository..."
-        git clone {{inputs.parameters.repo-url}} /workspace
-        cd /workspace
-        git checkout {{inputs.parameters.commit-sha}}
+        ${this.generateCheckoutScript()}
         
         echo "Synthesizing Pipeline CDK Stack (pipeline-specific resources only)..."
         cd pipeline-infra
-        npm install
-        npx cdk synth AphexPipelineStack
+        ${this.generateInstallDependenciesScript()}
+        npx cdk synth AphexPipelineStack --quiet --output cdk.out
         
         echo "Deploying Pipeline CDK Stack (updates WorkflowTemplate, EventSource, Sensor, etc.)..."
         echo "Note: This does NOT modify cluster infrastructure (EKS, Argo Workflows, Argo Events)"
-        npx cdk deploy AphexPipelineStack --require-approval never
+        npx cdk deploy AphexPipelineStack --app cdk.out --require-approval never
         
         echo "Pipeline deployment stage complete - changes will take effect in next workflow run"
         `,
@@ -238,24 +370,22 @@ export class WorkflowTemplateGenerator {
 
   /**
    * Generate a deployment stage for a specific environment.
+   * 
+   * The CDK app is synthesized once, just before deployment, and each stack is
+   * then deployed in configured order from the resulting cloud assembly so
+   * `cdk deploy` does not re-synthesize the app per stack. Stack outputs are
+   * written by `cdk deploy` itself rather than fetched with a separate
+   * CloudFormation call per stack, then merged into a single
+   * `{ "<stack>": { "<output>": "<value>" } }` document for the test stage.
    */
   private generateEnvironmentDeploymentStage(env: EnvironmentConfig): any {
     // Generate stack deployment commands in order
     const stackDeployments = env.stacks
       .map(
         (stack) => `
-        echo "Synthesizing stack: ${stack.name}..."
-        npx cdk synth ${stack.name}
-        
         echo "Deploying stack: ${stack.name}..."
-        npx cdk deploy ${stack.name} --require-approval never
-        
-        echo "Capturing outputs for stack: ${stack.name}..."
-        aws cloudformation describe-stacks \\
-          --stack-name ${stack.name} \\
-          --region ${env.region} \\
-          --query 'Stacks[0].Outputs' \\
-          > /tmp/${stack.name}-outputs.json || echo "No outputs for ${stack.name}"
+        npx cdk deploy ${stack.name} --app cdk.out --require-approval never \\
+          --outputs-file /tmp/stack-outputs/${stack.name}.json
         `
       )
       .join('\n        ');
@@ -286,27 +416,34 @@ export class WorkflowTemplateGenerator {
           '-c',
           `
         set -e
-        echo "Cloning repository..."
-        git clone {{inputs.parameters.repo-url}} /workspace
-        cd /workspace
-        git checkout {{inputs.parameters.commit-sha}}
+        ${this.generateCheckoutScript()}
         
         echo "Downloading artifacts from S3..."
+        ${this.generateS3TransferConfigScript('download')}
         mkdir -p ./artifacts
-        aws s3 sync {{inputs.parameters.artifact-path}} ./artifacts/ || echo "No artifacts to download"
+        AWS_CONFIG_FILE=${S3_TRANSFER_CONFIG_FILE} aws s3 sync {{inputs.parameters.artifact-path}} ./artifacts/ --exclude "${ARTIFACT_MANIFEST_NAME}" || echo "No artifacts to download"
+        if [ -f ./artifacts/${ARTIFACT_BUNDLE_NAME} ]; then
+          echo "Extracting artifact archive..."
+          tar -C ./artifacts -xf ./artifacts/${ARTIFACT_BUNDLE_NAME}
+          rm ./artifacts/${ARTIFACT_BUNDLE_NAME}
+        fi
         
         echo "Setting AWS region and account..."
         export AWS_REGION=${env.region}
         export AWS_ACCOUNT=${env.account}
         
         echo "Installing dependencies..."
-        npm install
+        ${this.generateInstallDependenciesScript()}
+        
+        echo "Synthesizing stacks for environment: ${env.name}..."
+        npx cdk synth --quiet --output cdk.out
         
         echo "Deploying stacks for environment: ${env.name}..."
+        mkdir -p /tmp/stack-outputs
         ${stackDeployments}
         
         echo "Consolidating stack outputs..."
-        echo "[]" > /tmp/stack-outputs.json
+        jq -s 'add // {}' /tmp/stack-outputs/*.json > /tmp/stack-outputs.json || echo "{}" > /tmp/stack-outputs.json
         
         echo "Environment ${env.name} deployment complete"
         `,
@@ -348,7 +485,9 @@ export class WorkflowTemplateGenerator {
       throw new Error(`No tests configured for environment: ${env.name}`);
     }
 
-    const testCommands = env.tests.commands.join('\n        ');
+    const testCommands = env.tests.parallel
+      ? this.generateParallelTestScript(env.name, env.tests.commands)
+      : env.tests.commands.join('\n        ');
 
     return {
       name: `test-${env.name}`,
@@ -366,13 +505,10 @@ export class WorkflowTemplateGenerator {
           '-c',
           `
         set -e
-        echo "Cloning repository..."
-        git clone {{inputs.parameters.repo-url}} /workspace
-        cd /workspace
-        git checkout {{inputs.parameters.commit-sha}}
+        ${this.generateCheckoutScript()}
         
         echo "Installing dependencies..."
-        npm install
+        ${this.generateInstallDependenciesScript()}
         
         echo "Running tests for environment: ${env.name}..."
         ${testCommands}
@@ -408,4 +544,43 @@ export class WorkflowTemplateGenerator {
       },
     };
   }
+
+  /**
+   * Generate the bash snippet that runs test commands concurrently.
+   *
+   * Each command runs in its own background subshell and is logged with its
+   * PID at launch. All of them are waited on; every failing command is
+   * reported with its exit code, and the stage fails if any command failed.
+   */
+  private generateParallelTestScript(envName: string, commands: string[]): string {
+    const launches = commands
+      .map((command) => {
+        const quotedCommand = `'${command.replace(/'/g, `'\\''`)}'`;
+        return `(
+        ${command}
+        ) &
+        TEST_PIDS+=($!)
+        TEST_COMMANDS+=(${quotedCommand})
+        echo "Started test command [$!]: \${TEST_COMMANDS[-1]}"`;
+      })
+      .join('\n        ');
+
+    return `TEST_PIDS=()
+        TEST_COMMANDS=()
+        ${launches}
+        TEST_FAILED=0
+        for i in "\${!TEST_PIDS[@]}"; do
+          if wait "\${TEST_PIDS[$i]}"; then
+            echo "Test command passed [\${TEST_PIDS[$i]}]: \${TEST_COMMANDS[$i]}"
+          else
+            TEST_STATUS=$?
+            echo "Test command failed with exit code $TEST_STATUS [\${TEST_PIDS[$i]}]: \${TEST_COMMANDS[$i]}"
+            TEST_FAILED=1
+          fi
+        done
+        if [ "$TEST_FAILED" -ne 0 ]; then
+          echo "One or more test commands failed for environment: ${envName}"
+          exit 1
+        fi`;
+  }
 }
@@ -0,0 +1,137 @@
+import * as fs from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+import { ConfigParser } from '../lib/config-parser';
+
+describe('ConfigParser', () => {
+  let tmpDir: string;
+
+  beforeEach(() => {
+    tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), 'aphex-config-'));
+  });
+
+  afterEach(() => {
+    fs.rmSync(tmpDir, { recursive: true, force: true });
+  });
+
+  const writeConfig = (contents: string): string => {
+    const configPath = path.join(tmpDir, 'aphex-config.yaml');
+    fs.writeFileSync(configPath, contents);
+    return configPath;
+  };
+
+  const validConfig = `
+version: "1.0"
+build:
+  commands:
+    - npm install
+    - npm run build
+environments:
+  - name: dev
+    region: us-east-1
+    account: "123456789012"
+    stacks:
+      - name: MyAppStack
+        path: lib/my-app-stack.ts
+    tests:
+      commands:
+        - npm run test:integration
+`;
+
+  test('Parses a valid configuration', () => {
+    const config = ConfigParser.parse(writeConfig(validConfig));
+
+    expect(config.version).toBe('1.0');
+    expect(config.build.commands).toEqual(['npm install', 'npm run build']);
+    expect(config.environments).toHaveLength(1);
+    expect(config.environments[0].stacks).toEqual([
+      { name: 'MyAppStack', path: 'lib/my-app-stack.ts' },
+    ]);
+    expect(config.environments[0].tests).toEqual({ commands: ['npm run test:integration'] });
+  });
+
+  test('Reuses the parsed configuration while the file is unchanged', () => {
+    const configPath = writeConfig(validConfig);
+    fs.utimesSync(configPath, 1700000000, 1700000000);
+    ConfigParser.parse(configPath);
+
+    // Same size and mtime, different contents: only a cache hit returns "1.0"
+    writeConfig(validConfig.replace('version: "1.0"', 'version: "2.0"'));
+    fs.utimesSync(configPath, 1700000000, 1700000000);
+    const config = ConfigParser.parse(path.relative(process.cwd(), configPath));
+
+    expect(config.version).toBe('1.0');
+  });
+
+  test('Changes to a returned configuration do not affect later calls', () => {
+    const configPath = writeConfig(validConfig);
+
+    const first = ConfigParser.parse(configPath);
+    first.build.commands.push('npm run extra');
+    first.environments.push({ ...first.environments[0], name: 'extra' });
+
+    const second = ConfigParser.parse(configPath);
+
+    expect(second).not.toBe(first);
+    expect(second.build.commands).toEqual(['npm install', 'npm run build']);
+    expect(second.environments).toHaveLength(1);
+  });
+
+  test('Re-parses the configuration after the file changes', () => {
+    const configPath = writeConfig(validConfig);
+    const first = ConfigParser.parse(configPath);
+
+    writeConfig(validConfig.replace('version: "1.0"', 'version: "1.0.1"'));
+    const second = ConfigParser.parse(configPath);
+
+    expect(second).not.toBe(first);
+    expect(second.version).toBe('1.0.1');
+  });
+
+  test('Rejects build commands that are not a list of strings', () => {
+    const configPath = writeConfig(
+      validConfig.replace('    - npm install\n    - npm run build\n', '    - npm install\n    - run: build\n')
+    );
+
+    expect(() => ConfigParser.parse(configPath)).toThrow(
+      'Configuration field build.commands must be a list of strings'
+    );
+  });
+
+  test('Rejects build commands given as a single string', () => {
+    const configPath = writeConfig(
+      validConfig.replace('  commands:\n    - npm install\n    - npm run build\n', '  commands: npm install\n')
+    );
+
+    expect(() => ConfigParser.parse(configPath)).toThrow(
+      'Configuration field build.commands must be a list of strings'
+    );
+  });
+
+  test('Parses parallel test execution', () => {
+    const config = ConfigParser.parse(
+      writeConfig(validConfig.replace('    tests:\n', '    tests:\n      parallel: true\n'))
+    );
+
+    expect(config.environments[0].tests).toEqual({
+      commands: ['npm run test:integration'],
+      parallel: true,
+    });
+  });
+
+  test('Rejects a non-boolean parallel test flag', () => {
+    const configPath = writeConfig(validConfig.replace('    tests:\n', '    tests:\n      parallel: "yes"\n'));
+
+    expect(() => ConfigParser.parse(configPath)).toThrow(
+      'Configuration field tests.parallel must be a boolean'
+    );
+  });
+
+  test('Reports a missing configuration file', () => {
+    const missingPath = path.join(tmpDir, 'missing.yaml');
+
+    expect(() => ConfigParser.parse(missingPath)).toThrow(
+      `Configuration file not found: ${missingPath}`
+    );
+  });
+});
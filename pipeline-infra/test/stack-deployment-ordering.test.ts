@@ -90,7 +90,7 @@ describe('Property 9: Stack deployment ordering', () => {
     );
   });
 
-  test('Stack synthesis commands appear before deployment commands in the same order', () => {
+  test('Stacks are synthesized once before any stack is deployed', () => {
     fc.assert(
       fc.property(aphexConfigArb, (config: AphexConfig) => {
         const generator = new WorkflowTemplateGenerator(
@@ -117,29 +117,28 @@ describe('Property 9: Stack deployment ordering', () => {
           // Get the deployment script from the container args
           const deploymentScript = stage.container.args[1];
 
-          // Extract all stack-related commands (synthesis and deployment)
+          // The app is synthesized exactly once for the environment
           const synthMatches = Array.from(
-            deploymentScript.matchAll(/Synthesizing stack: ([A-Za-z0-9-]+)\.\.\./g)
+            deploymentScript.matchAll(/Synthesizing stacks for environment: ([a-z0-9-]+)\.\.\./g)
           ) as RegExpMatchArray[];
+          expect(synthMatches.length).toBe(1);
+          expect(synthMatches[0][1]).toBe(env.name);
+
+          // Deployment order still matches configuration
           const deployMatches = Array.from(
             deploymentScript.matchAll(/Deploying stack: ([A-Za-z0-9-]+)\.\.\./g)
           ) as RegExpMatchArray[];
-
-          // Should have as many synthesis commands as stacks
-          expect(synthMatches.length).toBe(env.stacks.length);
           expect(deployMatches.length).toBe(env.stacks.length);
-
-          // Verify synthesis and deployment order matches configuration
           env.stacks.forEach((stack, index) => {
-            expect(synthMatches[index][1]).toBe(stack.name);
             expect(deployMatches[index][1]).toBe(stack.name);
           });
 
-          // Verify that for each stack, synthesis appears before deployment
+          // Every stack is deployed from the synthesized assembly, after synthesis
+          const synthIndex = deploymentScript.indexOf(`Synthesizing stacks for environment: ${env.name}`);
           env.stacks.forEach((stack) => {
-            const synthIndex = deploymentScript.indexOf(`Synthesizing stack: ${stack.name}`);
             const deployIndex = deploymentScript.indexOf(`Deploying stack: ${stack.name}`);
             expect(synthIndex).toBeLessThan(deployIndex);
+            expect(deploymentScript).toContain(`npx cdk deploy ${stack.name} --app cdk.out`);
           });
         });
       }),
@@ -147,7 +146,7 @@ describe('Property 9: Stack deployment ordering', () => {
     );
   });
 
-  test('Stack output capture commands appear after deployment in the same order', () => {
+  test('Stack outputs are captured by each deployment in the same order', () => {
     fc.assert(
       fc.property(aphexConfigArb, (config: AphexConfig) => {
         const generator = new WorkflowTemplateGenerator(
@@ -162,7 +161,7 @@ describe('Property 9: Stack deployment ordering', () => {
         );
         const workflowTemplate = generator.generate();
 
-        // For each environment, verify output capture happens after deployment
+        // For each environment, verify outputs are captured as part of each deployment
         config.environments.forEach((env) => {
           const stageName = `deploy-${env.name}`;
           const stage = workflowTemplate.spec.templates.find(
@@ -174,12 +173,12 @@ describe('Property 9: Stack deployment ordering', () => {
           // Get the deployment script from the container args
           const deploymentScript = stage.container.args[1];
 
-          // Extract output capture commands
+          // Extract output files written by the deploy commands
           const outputMatches = Array.from(
-            deploymentScript.matchAll(/Capturing outputs for stack: ([A-Za-z0-9-]+)\.\.\./g)
+            deploymentScript.matchAll(/--outputs-file \/tmp\/stack-outputs\/([A-Za-z0-9-]+)\.json/g)
           ) as RegExpMatchArray[];
 
-          // Should have as many output capture commands as stacks
+          // Should have as many output files as stacks
           expect(outputMatches.length).toBe(env.stacks.length);
 
           // Verify output capture order matches configuration
@@ -189,11 +188,12 @@ describe('Property 9: Stack deployment ordering', () => {
             expect(stackNameInScript).toBe(expectedStackName);
           });
 
-          // Verify that for each stack, deployment appears before output capture
+          // Verify that each stack's outputs are written by its own deploy command
           env.stacks.forEach((stack) => {
-            const deployIndex = deploymentScript.indexOf(`Deploying stack: ${stack.name}`);
-            const outputIndex = deploymentScript.indexOf(`Capturing outputs for stack: ${stack.name}`);
-            expect(deployIndex).toBeLessThan(outputIndex);
+            expect(deploymentScript).toContain(
+              `npx cdk deploy ${stack.name} --app cdk.out --require-approval never \\\n` +
+              `          --outputs-file /tmp/stack-outputs/${stack.name}.json`
+            );
           });
         });
       }),
@@ -0,0 +1,289 @@
+import { S3TransferOptions, WorkflowTemplateGenerator } from '../lib/workflow-template-generator';
+import { AphexConfig } from '../lib/config-parser';
+
+/**
+ * Tests for the bash scripts embedded in generated WorkflowTemplate stages.
+ */
+describe('WorkflowTemplate stage scripts', () => {
+  const config: AphexConfig = {
+    version: '1.0',
+    build: {
+      commands: ['npm install', 'npm run build'],
+    },
+    environments: [
+      {
+        name: 'dev',
+        region: 'us-east-1',
+        account: '123456789012',
+        stacks: [{ name: 'MyAppStack', path: 'lib/my-app-stack.ts' }],
+        tests: { commands: ['npm run test:integration'] },
+      },
+    ],
+  };
+
+  const generateTemplates = (
+    aphexConfig: AphexConfig = config,
+    s3TransferOptions: S3TransferOptions = {}
+  ): any[] => {
+    const generator = new WorkflowTemplateGenerator(
+      aphexConfig,
+      'test-bucket',
+      'test-service-account',
+      'test-builder-image',
+      'test-deployer-image',
+      'test-role-arn',
+      'test-workflow-template',
+      'argo',
+      s3TransferOptions
+    );
+    return generator.generate().spec.templates;
+  };
+
+  const getScript = (
+    stageName: string,
+    aphexConfig: AphexConfig = config,
+    s3TransferOptions: S3TransferOptions = {}
+  ): string => {
+    const stage = generateTemplates(aphexConfig, s3TransferOptions).find(
+      (template: any) => template.name === stageName
+    );
+    return stage.container.args[1];
+  };
+
+  describe('Repository checkout', () => {
+    test.each(['build', 'pipeline-deployment', 'deploy-dev', 'test-dev'])(
+      '%s stage fetches only the workflow commit',
+      (stageName: string) => {
+        const script = getScript(stageName);
+
+        expect(script).toContain('git -c protocol.version=2 fetch --depth=1 origin {{inputs.parameters.commit-sha}}');
+        expect(script).toContain('git checkout -q --detach FETCH_HEAD');
+        expect(script).not.toContain('git clone');
+      }
+    );
+
+    test('Build stage falls back to a full fetch when fetch by SHA is rejected', () => {
+      const script = getScript('build');
+
+      const shallowIndex = script.indexOf('fetch --depth=1');
+      const fallbackIndex = script.indexOf('git -c protocol.version=2 fetch origin\n');
+      expect(fallbackIndex).toBeGreaterThan(shallowIndex);
+      expect(script).toContain('git checkout -q --detach {{inputs.parameters.commit-sha}}');
+    });
+
+    test('Checkout enables parallel submodule fetches', () => {
+      const script = getScript('build');
+
+      expect(script).toContain('git config submodule.fetchJobs 0');
+    });
+  });
+
+  describe('Dependency installation', () => {
+    test('Environment deployment stage installs from the lockfile when present', () => {
+      const script = getScript('deploy-dev');
+
+      expect(script).toContain('if [ -f package-lock.json ]; then');
+      expect(script).toContain('npm ci --prefer-offline --no-audit --no-fund');
+      expect(script).toContain('npm install --no-audit --no-fund');
+    });
+
+    test('Pipeline deployment and test stages install from the lockfile when present', () => {
+      for (const stageName of ['pipeline-deployment', 'test-dev']) {
+        const script = getScript(stageName);
+        expect(script).toContain('npm ci --prefer-offline --no-audit --no-fund');
+        expect(script).not.toMatch(/^\s*npm install\s*$/m);
+      }
+    });
+  });
+
+  describe('Test execution', () => {
+    const parallelConfig: AphexConfig = {
+      ...config,
+      environments: [
+        {
+          ...config.environments[0],
+          tests: { commands: ['npm run test:api', 'npm run test:ui'], parallel: true },
+        },
+      ],
+    };
+
+    test('Test commands run one after another by default', () => {
+      const script = getScript('test-dev');
+
+      expect(script).toContain('npm run test:integration');
+      expect(script).not.toContain('TEST_PIDS');
+    });
+
+    test('Parallel test commands run in the background and are all awaited', () => {
+      const script = getScript('test-dev', parallelConfig);
+
+      expect(script).toContain('(\n        npm run test:api\n        ) &');
+      expect(script).toContain('(\n        npm run test:ui\n        ) &');
+      expect(script).toContain('if wait "${TEST_PIDS[$i]}"; then');
+      expect(script.indexOf('if wait')).toBeGreaterThan(script.indexOf('npm run test:ui'));
+      expect(script).toContain('exit 1');
+    });
+
+    test('Parallel test stage reports each failing command with its exit code', () => {
+      const script = getScript('test-dev', parallelConfig);
+
+      expect(script).toContain("TEST_COMMANDS+=('npm run test:api')");
+      expect(script).toContain("TEST_COMMANDS+=('npm run test:ui')");
+      expect(script).toContain('TEST_STATUS=$?');
+      expect(script).toContain(
+        'echo "Test command failed with exit code $TEST_STATUS [${TEST_PIDS[$i]}]: ${TEST_COMMANDS[$i]}"'
+      );
+    });
+  });
+
+  describe('Pipeline deployment', () => {
+    test('Pipeline stack is deployed from the synthesized cloud assembly', () => {
+      const script = getScript('pipeline-deployment');
+
+      const synthIndex = script.indexOf('npx cdk synth AphexPipelineStack --quiet --output cdk.out');
+      const deployIndex = script.indexOf('npx cdk deploy AphexPipelineStack --app cdk.out --require-approval never');
+      expect(synthIndex).toBeGreaterThan(-1);
+      expect(deployIndex).toBeGreaterThan(synthIndex);
+    });
+  });
+
+  describe('Stack outputs', () => {
+    test('Deploy stage merges per-stack outputs after all stacks are deployed', () => {
+      const script = getScript('deploy-dev');
+
+      const deployIndex = script.indexOf('--outputs-file /tmp/stack-outputs/MyAppStack.json');
+      const mergeIndex = script.indexOf("jq -s 'add // {}' /tmp/stack-outputs/*.json > /tmp/stack-outputs.json");
+      expect(deployIndex).toBeGreaterThan(-1);
+      expect(mergeIndex).toBeGreaterThan(deployIndex);
+      expect(script).not.toContain('aws cloudformation describe-stacks');
+    });
+  });
+
+  describe('Artifact transfer', () => {
+    test('Build stage tunes S3 transfers before uploading artifacts', () => {
+      const script = getScript('build');
+
+      const configIndex = script.indexOf('> /tmp/aws/config');
+      const syncIndex = script.indexOf('AWS_CONFIG_FILE=/tmp/aws/config aws s3 sync ./artifacts');
+      expect(configIndex).toBeGreaterThan(-1);
+      expect(configIndex).toBeLessThan(syncIndex);
+      expect(script).toContain('multipart_chunksize = 50MB');
+    });
+
+    test('Transfer settings apply only to artifact transfer commands', () => {
+      for (const stageName of ['build', 'deploy-dev']) {
+        const script = getScript(stageName);
+        const transferCommands = script.match(/.*aws s3 (cp|sync) .*/g) ?? [];
+
+        expect(script).not.toContain('export AWS_CONFIG_FILE');
+        expect(transferCommands.length).toBeGreaterThan(0);
+        transferCommands.forEach((line) => {
+          expect(line).toContain('AWS_CONFIG_FILE=/tmp/aws/config aws s3 ');
+        });
+      }
+    });
+
+    test('Build stage uploads with the CRT transfer client', () => {
+      const script = getScript('build');
+
+      expect(script).toContain('preferred_transfer_client = crt');
+      expect(script).not.toContain('max_concurrent_requests');
+      expect(script).toContain('target_bandwidth = 5Gb/s');
+    });
+
+    test('Build stage uploads with adaptive retries', () => {
+      const script = getScript('build');
+
+      expect(script).toContain('retry_mode = adaptive');
+      expect(script).toContain('max_attempts = 10');
+    });
+
+    test('Build stage skips the upload when the artifacts directory is empty', () => {
+      const script = getScript('build');
+
+      expect(script).toContain('ARTIFACT_COUNT=$(find -L ./artifacts -type f 2>/dev/null | wc -l)');
+      expect(script).toContain('if [ "$ARTIFACT_COUNT" -eq 0 ]; then');
+    });
+
+    test('Build stage bundles large artifact sets into a single archive', () => {
+      const script = getScript('build');
+
+      expect(script).toContain(
+        'elif [ "$ARTIFACT_COUNT" -gt 20 ] && [ "$ARTIFACT_BYTES" -le 104857600 ]; then'
+      );
+      expect(script).toContain(
+        'tar -C ./artifacts -chf - . | AWS_CONFIG_FILE=/tmp/aws/config aws s3 cp - s3://test-bucket/{{inputs.parameters.commit-sha}}/.aphex-artifacts.tar'
+      );
+      expect(script).toContain(
+        's3://test-bucket/{{inputs.parameters.commit-sha}}/.aphex-artifacts-manifest.txt'
+      );
+    });
+
+    test('Deploy stage tunes S3 transfers before downloading artifacts', () => {
+      const script = getScript('deploy-dev');
+
+      const configIndex = script.indexOf('> /tmp/aws/config');
+      const syncIndex = script.indexOf(
+        'AWS_CONFIG_FILE=/tmp/aws/config aws s3 sync {{inputs.parameters.artifact-path}} ./artifacts/ --exclude'
+      );
+      expect(configIndex).toBeGreaterThan(-1);
+      expect(configIndex).toBeLessThan(syncIndex);
+    });
+
+    test('Deploy stage downloads large artifacts as parallel ranged GETs', () => {
+      const script = getScript('deploy-dev');
+
+      expect(script).toContain('multipart_threshold = 8MB');
+      expect(script).toContain('multipart_chunksize = 8MB');
+    });
+
+    test('Transfer part size can be overridden', () => {
+      const options = { multipartChunksize: '16MB' };
+
+      for (const stageName of ['build', 'deploy-dev']) {
+        const script = getScript(stageName, config, options);
+        expect(script).toContain('multipart_chunksize = 16MB');
+      }
+    });
+
+    test('Bundled artifacts follow symlinks like aws s3 sync does', () => {
+      const script = getScript('build');
+
+      expect(script).toContain('find -L ./artifacts -type f');
+      expect(script).toContain('du -sbL ./artifacts');
+      expect(script).toContain('(cd ./artifacts && find -L . -type f)');
+      expect(script).toContain('tar -C ./artifacts -chf - .');
+      expect(script).not.toMatch(/find \.\/artifacts|find \. -type|tar -C \.\/artifacts -cf/);
+    });
+
+    test('Deploy stage does not download the artifact archive manifest', () => {
+      const script = getScript('deploy-dev');
+
+      expect(script).toContain(
+        'aws s3 sync {{inputs.parameters.artifact-path}} ./artifacts/ --exclude ".aphex-artifacts-manifest.txt"'
+      );
+    });
+
+    test.each(['16MB', '16MiB', '1GB', '16777216'])('Accepts multipart chunk size %s', (size: string) => {
+      expect(() => generateTemplates(config, { multipartChunksize: size })).not.toThrow();
+    });
+
+    test.each(['0MB', '16 MB', "16MB' && rm -rf / #", ''])(
+      'Rejects an invalid multipart chunk size: %s',
+      (size: string) => {
+        expect(() => generateTemplates(config, { multipartChunksize: size })).toThrow(
+          /multipartChunksize must be a positive size/
+        );
+      }
+    );
+
+    test('Deploy stage extracts the artifact archive after downloading', () => {
+      const script = getScript('deploy-dev');
+
+      const syncIndex = script.indexOf('aws s3 sync {{inputs.parameters.artifact-path}} ./artifacts/ --exclude');
+      const extractIndex = script.indexOf('tar -C ./artifacts -xf ./artifacts/.aphex-artifacts.tar');
+      expect(syncIndex).toBeGreaterThan(-1);
+      expect(extractIndex).toBeGreaterThan(syncIndex);
+    });
+  });
+});